@@ -24,15 +24,28 @@ Changes in v2.2.1:
 Notes on the popup timeout:
 - MessageBoxTimeoutW is a Windows API function. It is available on modern Windows.
 - If the timeout call fails for any reason, we fall back to a normal MessageBox.
+
+Notes on voice:
+- If comtypes (or pywin32) is installed, SAPI is driven in-process and speech is
+  asynchronous. Otherwise each alert is spoken via a PowerShell subprocess.
 """
 
 from __future__ import annotations
 
+import ctypes
+import errno
+import logging
+import os
+import queue
+import re
+import selectors
+import signal
 import socket
 import subprocess
+import sys
 import time
 import threading
-from typing import Dict, Optional, TypedDict
+from collections.abc import Callable
 
 
 # -----------------------------
@@ -44,6 +57,20 @@ VERSION = "2.2.1"
 UDP_BIND_IP = "0.0.0.0"
 UDP_PORT = 9932
 
+# Optional: only accept packets from this sender IP (e.g. "192.168.1.20"). None => any.
+# Packets from other hosts are discarded by the receive loop before any parsing.
+# Note: remote quit packets must then also come from this host.
+SAT_SENDER_IP: str | None = None
+
+# Kernel receive buffer for the UDP socket. A large buffer absorbs the burst of
+# queued packets the sender may flush after sleep/resume. If the OS refuses this
+# size we halve it until accepted.
+UDP_RCVBUF_BYTES = 4_194_304  # 4 MB
+
+# Max datagram size, and how many datagrams to pull per syscall on Linux (recvmmsg)
+RECV_BUFSIZE = 2048
+RECV_BATCH = 32
+
 # Trigger when <= this many seconds remain
 ALERT_THRESHOLD_SECONDS = 60
 
@@ -62,16 +89,25 @@ ENABLE_VOICE = True
 # Speak only once per pass
 SPEAK_ONCE_PER_PASS = True
 
+# SAPI SpeechVoiceSpeakFlags: SVSFlagsAsync (return immediately, speak in background)
+SAPI_SPEAK_FLAGS = 1
+
 # Popup auto-close (seconds)
 POPUP_TIMEOUT_SECONDS = 10
 
+# Windows scheduling: run above normal priority, pinned to these CPUs (bit mask), so the
+# receive thread is not preempted long enough to skew the real-time check.
+# 0x2 = core 1 (core 0 left to the OS). Set the mask to 0 to leave affinity alone.
+RAISE_PROCESS_PRIORITY = True
+PROCESS_AFFINITY_MASK = 0x2
+
+# Console log level. Per-packet "FAOS ..." lines are DEBUG; set logging.DEBUG to see them.
+LOG_LEVEL = logging.INFO
+
 # Auto-restart parameters
 RESTART_ON_ERROR = True
 RESTART_DELAY_SECONDS = 2.0
 
-# Socket timeout so we can periodically check stop_event
-SOCKET_TIMEOUT_SECONDS = 1.0
-
 # Remote quit packets (case-insensitive)
 REMOTE_QUIT_STRINGS = {"QUIT", "SAT,QUIT"}
 
@@ -88,15 +124,31 @@ GAP_REQUIRES_RESYNC_SECONDS = 5 * 60  # 5 minutes
 CONSECUTIVE_GOOD_REQUIRED = 2
 
 
+log = logging.getLogger("sat_udp")
+log.setLevel(LOG_LEVEL)
+
+
 # -----------------------------
 # State types
 # -----------------------------
 
-class SatState(TypedDict):
-    last_ttg: Optional[int]
+class SatState:
+    """Per-satellite tracking state, mutated in place for every packet."""
+
+    __slots__ = ("last_ttg", "last_seen", "good_count", "pass_gen", "alerted_gen")
+
+    last_ttg: int | None
     last_seen: float
-    alerted: bool
     good_count: int  # consecutive time-consistent packets
+    pass_gen: int  # bumped on every new pass
+    alerted_gen: int  # pass_gen of the last pass we alerted on
+
+    def __init__(self) -> None:
+        self.last_ttg = None
+        self.last_seen = 0.0
+        self.good_count = 0
+        self.pass_gen = 0
+        self.alerted_gen = -1
 
 
 # -----------------------------
@@ -119,11 +171,53 @@ def run_powershell(command: str) -> None:
     )
 
 
+_sapi_voice = None
+_sapi_unavailable = False
+_sapi_lock = threading.Lock()
+
+
+def get_sapi_voice() -> object | None:
+    """
+    Create the SAPI.SpVoice COM object once and reuse it.
+    Returns None if neither comtypes nor pywin32 can provide it.
+    """
+    global _sapi_voice, _sapi_unavailable
+
+    with _sapi_lock:
+        if _sapi_voice is not None or _sapi_unavailable:
+            return _sapi_voice
+
+        try:
+            import comtypes.client
+            _sapi_voice = comtypes.client.CreateObject("SAPI.SpVoice")
+        except Exception:
+            try:
+                import win32com.client
+                _sapi_voice = win32com.client.Dispatch("SAPI.SpVoice")
+            except Exception:
+                _sapi_unavailable = True
+
+        return _sapi_voice
+
+
 def speak(text: str) -> None:
     """
-    Speak text with Windows SAPI via PowerShell.
+    Speak text with Windows SAPI, in-process if possible.
     Note: Azimuth is intentionally NOT included (per request).
     """
+    voice = get_sapi_voice()
+    if voice is not None:
+        try:
+            voice.Speak(text, SAPI_SPEAK_FLAGS)
+            return
+        except Exception:
+            pass  # fall back to PowerShell
+
+    speak_powershell(text)
+
+
+def speak_powershell(text: str) -> None:
+    """Speak text with Windows SAPI via a PowerShell subprocess (slow fallback)."""
     safe = text.replace('"', '`"')
     ps = (
         "Add-Type -AssemblyName System.Speech; "
@@ -133,26 +227,30 @@ def speak(text: str) -> None:
     run_powershell(ps)
 
 
-def popup_timeout(title: str, message: str, timeout_seconds: int) -> None:
+MB_OK = 0x00000000
+MB_SYSTEMMODAL = 0x00001000
+
+# Popup arguments are fixed by configuration, so compute them once
+_MB_FLAGS = MB_OK | MB_SYSTEMMODAL
+_POPUP_TIMEOUT_MS = int(POPUP_TIMEOUT_SECONDS * 1000)
+
+
+def _bind_message_box() -> tuple[object | None, object | None]:
     """
-    Show a MessageBox that auto-closes after timeout_seconds.
-    Falls back to a normal MessageBox if MessageBoxTimeoutW is unavailable.
+    Look up user32 and bind MessageBoxTimeoutW once at import.
 
     Uses the undocumented-but-common MessageBoxTimeoutW signature:
       int MessageBoxTimeoutW(HWND, LPCWSTR, LPCWSTR, UINT, WORD, DWORD)
     """
-    import ctypes
-    from ctypes import wintypes
+    if sys.platform != "win32":
+        return None, None
 
-    MB_OK = 0x00000000
-    MB_SYSTEMMODAL = 0x00001000
+    from ctypes import wintypes
 
     user32 = ctypes.windll.user32
-
-    # Try MessageBoxTimeoutW first
-    try:
-        MessageBoxTimeoutW = user32.MessageBoxTimeoutW
-        MessageBoxTimeoutW.argtypes = [
+    fn = getattr(user32, "MessageBoxTimeoutW", None)
+    if fn is not None:
+        fn.argtypes = [
             wintypes.HWND,       # hWnd
             wintypes.LPCWSTR,    # lpText
             wintypes.LPCWSTR,    # lpCaption
@@ -160,217 +258,517 @@ def popup_timeout(title: str, message: str, timeout_seconds: int) -> None:
             wintypes.WORD,       # wLanguageId
             wintypes.DWORD,      # dwMilliseconds
         ]
-        MessageBoxTimeoutW.restype = ctypes.c_int
-
-        MessageBoxTimeoutW(
-            0,
-            message,
-            title,
-            MB_OK | MB_SYSTEMMODAL,
-            0,
-            int(timeout_seconds * 1000),
-        )
-        return
-    except Exception:
+        fn.restype = ctypes.c_int
+    return user32, fn
+
+
+_user32, _MessageBoxTimeoutW = _bind_message_box()
+
+
+def popup_timeout(title: str, message: str) -> None:
+    """
+    Show a MessageBox that auto-closes after POPUP_TIMEOUT_SECONDS.
+    Falls back to a normal MessageBox if MessageBoxTimeoutW is unavailable.
+    """
+    if _MessageBoxTimeoutW is not None:
+        _MessageBoxTimeoutW(0, message, title, _MB_FLAGS, 0, _POPUP_TIMEOUT_MS)
+    elif _user32 is not None:
         # Fallback: regular MessageBox (requires user click)
-        user32.MessageBoxW(0, message, title, MB_OK | MB_SYSTEMMODAL)
+        _user32.MessageBoxW(0, message, title, _MB_FLAGS)
+    else:
+        raise OSError("MessageBox is only available on Windows")
+
+
+def set_recv_buffer(sock: socket.socket, size: int) -> int:
+    """
+    Request a receive buffer of `size` bytes, halving on refusal.
+    Returns the size actually granted by the kernel.
+    (Linux caps silently at net.core.rmem_max and reports double the value.)
+    """
+    while size >= 65536:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+            break
+        except OSError:
+            size //= 2
+    return sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+
 
+# REMOTE_QUIT_STRINGS as one bytes pattern (padding tolerated, case-insensitive), so
+# quit detection works directly on the receive buffer without decoding or copying it
+_REMOTE_QUIT_RE = re.compile(
+    rb"[\s\x00]*(?:"
+    + b"|".join(re.escape(q.encode("ascii")) for q in sorted(REMOTE_QUIT_STRINGS))
+    + rb")[\s\x00]*",
+    re.IGNORECASE,
+)
 
-def normalize_raw(raw: str) -> str:
-    return raw.strip().strip("\x00").strip()
 
+def is_remote_quit_packet(data: bytes | memoryview) -> bool:
+    return _REMOTE_QUIT_RE.fullmatch(data) is not None
 
-def is_remote_quit_packet(raw: str) -> bool:
-    s = normalize_raw(raw).upper()
-    return s in REMOTE_QUIT_STRINGS
 
+# ALLOWED_SATS filter, chosen once: an empty set means "accept all", so skip the check
+_ALLOWED_SATS = frozenset(ALLOWED_SATS)
+sat_allowed = _ALLOWED_SATS.__contains__ if _ALLOWED_SATS else (lambda name: True)
 
-def parse_faos_packet(raw: str) -> Optional[tuple[str, float, int]]:
+
+# SAT,FAOS,NAME,AZIMUTH,TIMETOGO (leading padding and spaces around fields tolerated)
+_FAOS_RE = re.compile(rb"[\s\x00]*SAT\s*,\s*FAOS\s*,\s*([^,]+?)\s*,\s*([^,]*?)\s*,\s*([^,\s\x00]+)")
+
+
+def parse_faos_packet(data: bytes | memoryview) -> tuple[str, bytes, int] | None:
     """
     Parse: SAT,FAOS,NAME,AZIMUTH,TIMETOGO
-    Returns: (name, azimuth, ttg) or None
+    Returns: (name, raw azimuth field, ttg) or None
+
+    The azimuth is not used (not spoken), so it is passed through unparsed
+    for the debug log only.
+
+    Works on the raw datagram so non-FAOS traffic is rejected by the regex
+    without decoding or splitting it.
     """
-    parts = [p.strip() for p in normalize_raw(raw).split(",")]
-    if len(parts) < 5:
+    m = _FAOS_RE.match(data)
+    if m is None:
         return None
 
-    prefix, event, name, az_str, ttg_str = parts[:5]
-    if prefix != "SAT" or event != "FAOS":
+    name_b, az_b, ttg_b = m.groups()
+    try:
+        ttg = int(float(ttg_b))
+    except (ValueError, OverflowError):
         return None
 
+    return name_b.decode(errors="ignore"), az_b, ttg
+
+
+# -----------------------------
+# Datagram receive (batched on Linux)
+# -----------------------------
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_SOCKADDR_IN_SIZE = 16
+
+
+def _load_recvmmsg() -> object | None:
+    if not sys.platform.startswith("linux"):
+        return None
     try:
-        az = float(az_str)  # still parsed for completeness (not spoken)
-        ttg = int(float(ttg_str))
-    except ValueError:
+        libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        fn = libc.recvmmsg
+    except (OSError, AttributeError):
         return None
+    fn.argtypes = [
+        ctypes.c_int,
+        ctypes.POINTER(_MMsgHdr),
+        ctypes.c_uint,
+        ctypes.c_int,
+        ctypes.c_void_p,
+    ]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_recvmmsg = _load_recvmmsg()
+
+
+class DatagramReceiver:
+    """
+    Pull ready datagrams off a UDP socket.
+
+    On Linux one recvmmsg() call drains up to RECV_BATCH queued datagrams
+    (a resume burst costs one syscall, not dozens). Elsewhere it falls back to
+    a single recvfrom_into() per wakeup.
+
+    Datagrams land in buffers preallocated here and are returned as memoryview
+    slices, valid only until the next recv_batch() call.
+    """
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.batched = _recvmmsg is not None
+
+        nbufs = RECV_BATCH if self.batched else 1
+        self.bufs = [bytearray(RECV_BUFSIZE) for _ in range(nbufs)]
+        self.views = [memoryview(b) for b in self.bufs]
+        if not self.batched:
+            return
+
+        self.names = [ctypes.create_string_buffer(_SOCKADDR_IN_SIZE) for _ in range(RECV_BATCH)]
+        self.iovs = (_IoVec * RECV_BATCH)()
+        self.msgs = (_MMsgHdr * RECV_BATCH)()
+
+        for i in range(RECV_BATCH):
+            cbuf = (ctypes.c_char * RECV_BUFSIZE).from_buffer(self.bufs[i])
+            self.iovs[i].iov_base = ctypes.addressof(cbuf)
+            self.iovs[i].iov_len = RECV_BUFSIZE
+            hdr = self.msgs[i].msg_hdr
+            hdr.msg_name = ctypes.addressof(self.names[i])
+            hdr.msg_iov = ctypes.pointer(self.iovs[i])
+            hdr.msg_iovlen = 1
+
+    def recv_batch(self) -> list[tuple[memoryview, tuple[str, int]]]:
+        if not self.batched:
+            nbytes, addr = self.sock.recvfrom_into(self.bufs[0], RECV_BUFSIZE)
+            return [(self.views[0][:nbytes], addr)]
+
+        for i in range(RECV_BATCH):
+            self.msgs[i].msg_hdr.msg_namelen = _SOCKADDR_IN_SIZE
+
+        n = _recvmmsg(self.sock.fileno(), self.msgs, RECV_BATCH, socket.MSG_DONTWAIT, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        out = []
+        for i in range(n):
+            name = self.names[i].raw
+            addr = (socket.inet_ntoa(name[4:8]), int.from_bytes(name[2:4], "big"))
+            out.append((self.views[i][: self.msgs[i].msg_len], addr))
+        return out
+
+
+# -----------------------------
+# Process scheduling (Windows)
+# -----------------------------
+
+def tune_process_scheduling() -> None:
+    """
+    Raise process priority and set CPU affinity per configuration.
+    Best effort: any failure leaves the default scheduling in place.
+    """
+    if sys.platform != "win32":
+        return
+
+    from ctypes import wintypes
+
+    ABOVE_NORMAL_PRIORITY_CLASS = 0x00008000
+
+    try:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        kernel32.SetPriorityClass.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+        kernel32.GetProcessAffinityMask.argtypes = [
+            wintypes.HANDLE,
+            ctypes.POINTER(ctypes.c_size_t),
+            ctypes.POINTER(ctypes.c_size_t),
+        ]
+        kernel32.SetProcessAffinityMask.argtypes = [wintypes.HANDLE, ctypes.c_size_t]
+
+        proc = kernel32.GetCurrentProcess()
 
-    return name, az, ttg
+        if RAISE_PROCESS_PRIORITY:
+            kernel32.SetPriorityClass(proc, ABOVE_NORMAL_PRIORITY_CLASS)
+
+        if PROCESS_AFFINITY_MASK:
+            proc_mask = ctypes.c_size_t()
+            sys_mask = ctypes.c_size_t()
+            if kernel32.GetProcessAffinityMask(proc, ctypes.byref(proc_mask), ctypes.byref(sys_mask)):
+                # Only pin if every requested CPU exists (e.g. skip 0x2 on a single-core box)
+                if PROCESS_AFFINITY_MASK & sys_mask.value == PROCESS_AFFINITY_MASK:
+                    kernel32.SetProcessAffinityMask(proc, PROCESS_AFFINITY_MASK)
+    except Exception as e:
+        log.debug("Process scheduling not changed: %s", e)
+
+
+# -----------------------------
+# Shutdown wakeup (self-pipe)
+# -----------------------------
+
+def make_wakeup_pair() -> tuple[socket.socket, socket.socket]:
+    """
+    Create the (read, write) socket pair used to wake the blocking listener.
+    socket.socketpair() uses a loopback TCP pair on Windows, so it works everywhere.
+    """
+    wake_r, wake_w = socket.socketpair()
+    wake_r.setblocking(False)
+    wake_w.setblocking(False)
+    return wake_r, wake_w
+
+
+def drain_wakeup(wake_r: socket.socket) -> None:
+    try:
+        while wake_r.recv(64):
+            pass
+    except OSError:
+        pass
+
+
+def request_stop(stop_event: threading.Event, wake_w: socket.socket) -> None:
+    """Set stop_event and wake the listener out of select()."""
+    stop_event.set()
+    try:
+        wake_w.send(b"\x00")
+    except OSError:
+        pass  # pipe full => listener is already being woken
 
 
 # -----------------------------
 # Hotkey thread (console-local)
 # -----------------------------
 
-def hotkey_watcher(stop_event: threading.Event) -> None:
+def hotkey_watcher(stop_event: threading.Event, wake_w: socket.socket) -> None:
     """
     Console-local hotkey watcher:
     - Press Q/q or Ctrl+Q to stop.
+
+    Blocks on the console input handle (WaitForSingleObject) and reads events
+    with ReadConsoleInputW, so the thread sleeps until a key is pressed.
     """
-    try:
-        import msvcrt
-    except Exception:
+    if sys.platform != "win32":
         return
 
+    from ctypes import wintypes
+
+    class KEY_EVENT_RECORD(ctypes.Structure):
+        _fields_ = [
+            ("bKeyDown", wintypes.BOOL),
+            ("wRepeatCount", wintypes.WORD),
+            ("wVirtualKeyCode", wintypes.WORD),
+            ("wVirtualScanCode", wintypes.WORD),
+            ("UnicodeChar", wintypes.WCHAR),
+            ("dwControlKeyState", wintypes.DWORD),
+        ]
+
+    # KEY_EVENT_RECORD is as large as the biggest member of the event union
+    class INPUT_RECORD(ctypes.Structure):
+        _fields_ = [("EventType", wintypes.WORD), ("KeyEvent", KEY_EVENT_RECORD)]
+
+    STD_INPUT_HANDLE = -10
+    INFINITE = 0xFFFFFFFF
+    WAIT_OBJECT_0 = 0
+    KEY_EVENT = 0x0001
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.GetStdHandle.argtypes = [wintypes.DWORD]
+    kernel32.GetStdHandle.restype = wintypes.HANDLE
+    kernel32.GetConsoleMode.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    kernel32.WaitForSingleObject.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+    kernel32.WaitForSingleObject.restype = wintypes.DWORD
+    kernel32.ReadConsoleInputW.argtypes = [
+        wintypes.HANDLE,
+        ctypes.POINTER(INPUT_RECORD),
+        wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD),
+    ]
+
+    h_in = kernel32.GetStdHandle(STD_INPUT_HANDLE)
+    mode = wintypes.DWORD()
+    if not h_in or not kernel32.GetConsoleMode(h_in, ctypes.byref(mode)):
+        return  # stdin is not a console (redirected / no console attached)
+
+    records = (INPUT_RECORD * 16)()
+    count = wintypes.DWORD()
+
     while not stop_event.is_set():
+        # Daemon thread: blocking forever is fine, process exit tears it down
+        if kernel32.WaitForSingleObject(h_in, INFINITE) != WAIT_OBJECT_0:
+            return
+        if not kernel32.ReadConsoleInputW(h_in, records, len(records), ctypes.byref(count)):
+            return
+
+        for rec in records[: count.value]:
+            if rec.EventType != KEY_EVENT or not rec.KeyEvent.bKeyDown:
+                continue
+            if rec.KeyEvent.UnicodeChar in ("q", "Q", "\x11"):  # Ctrl+Q = \x11
+                log.info("Hotkey quit received. Shutting down...")
+                request_stop(stop_event, wake_w)
+                return
+
+
+# -----------------------------
+# Alert workers
+# -----------------------------
+
+# One slot each: if an alert is still waiting when a newer one arrives, the newer wins.
+# Popups block for up to POPUP_TIMEOUT_SECONDS, so they must never run on the
+# receive thread; voice gets its own worker for the PowerShell fallback path.
+_voice_queue: queue.Queue = queue.Queue(maxsize=1)
+_popup_queue: queue.Queue = queue.Queue(maxsize=1)
+
+
+def post_latest(q: queue.Queue, item: tuple) -> None:
+    """Queue item without blocking, replacing any item not yet picked up."""
+    while True:
         try:
-            if msvcrt.kbhit():
-                ch = msvcrt.getwch()
-                if ch in ("q", "Q", "\x11"):  # Ctrl+Q = \x11
-                    print("[INFO] Hotkey quit received. Shutting down...")
-                    stop_event.set()
-                    return
-            else:
-                time.sleep(0.05)
-        except Exception:
-            time.sleep(0.2)
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def alert_worker(q: queue.Queue, label: str, fn: Callable[..., None]) -> None:
+    """Run fn(*item) for each queued item, forever (daemon thread)."""
+    while True:
+        args = q.get()
+        try:
+            fn(*args)
+        except Exception as e:
+            log.warning("%s failed: %s", label, e)
 
 
 # -----------------------------
 # Real-time consistency check
 # -----------------------------
 
-def update_realtime_good_count(st: SatState, ttg: int, now: float) -> SatState:
+def update_realtime_good_count(st: SatState, ttg: int, now: float) -> None:
     """
-    Update st.good_count based on whether TTG progression matches wall clock time.
+    Update st.good_count based on whether TTG progression matches elapsed time
+    (now is time.monotonic(), so clock corrections cannot fake a jump).
 
     If PC slept and then a burst of queued packets arrives, TTG will not align with
-    elapsed wall-clock time and good_count will not reach the required threshold.
+    elapsed time and good_count will not reach the required threshold.
     """
-    if st["last_ttg"] is None:
-        st["good_count"] = 1
-        return st
+    if st.last_ttg is None:
+        st.good_count = 1
+        return
 
-    elapsed = now - st["last_seen"]
+    elapsed = now - st.last_seen
 
     # Long silence => require re-sync (sleep/resume / sender paused)
     if elapsed >= GAP_REQUIRES_RESYNC_SECONDS:
-        st["good_count"] = 1
-        return st
+        st.good_count = 1
+        return
 
     # Expected: TTG decreases ~ elapsed seconds
-    delta_ttg = st["last_ttg"] - ttg
+    delta_ttg = st.last_ttg - ttg
     off_by = abs(delta_ttg - elapsed)
 
     if off_by <= TTG_TIME_CONSISTENCY_TOLERANCE_SECONDS:
-        st["good_count"] = min(CONSECUTIVE_GOOD_REQUIRED, st["good_count"] + 1)
+        st.good_count = min(CONSECUTIVE_GOOD_REQUIRED, st.good_count + 1)
     else:
-        st["good_count"] = 1
-
-    return st
-
-
-def realtime_ok(st: SatState) -> bool:
-    return st["good_count"] >= CONSECUTIVE_GOOD_REQUIRED
+        st.good_count = 1
 
 
 # -----------------------------
 # One run of listener
 # -----------------------------
 
-def listener_run(stop_event: threading.Event) -> None:
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind((UDP_BIND_IP, UDP_PORT))
-    sock.settimeout(SOCKET_TIMEOUT_SECONDS)
+def listener_run(stop_event: threading.Event, wake_r: socket.socket) -> None:
+    # Closing both on the way out (including crashes) frees the port for the restart
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock, selectors.DefaultSelector() as sel:
+        rcvbuf = set_recv_buffer(sock, UDP_RCVBUF_BYTES)
+        sock.bind((UDP_BIND_IP, UDP_PORT))
 
-    print(f"[INFO] sat_udp_popup.py v{VERSION}")
-    print(f"[INFO] Listening on UDP {UDP_BIND_IP}:{UDP_PORT}")
-    print("[INFO] Quit: Q / Ctrl+Q (console) OR UDP 'SAT,QUIT' to port 9932")
+        # Not done with connect(): that also pins the local address, which would
+        # drop the sender's broadcasts and traffic to any other local address.
+        sender_ip = SAT_SENDER_IP or None
 
-    state: Dict[str, SatState] = {}
+        # Block in the kernel until a packet arrives or main/hotkey wakes us to quit
+        sel.register(sock, selectors.EVENT_READ)
+        sel.register(wake_r, selectors.EVENT_READ)
 
-    while not stop_event.is_set():
-        try:
-            data, addr = sock.recvfrom(2048)
-        except socket.timeout:
-            continue
-        except OSError:
-            raise
+        receiver = DatagramReceiver(sock)
 
-        raw = data.decode(errors="ignore")
+        log.info("sat_udp_popup.py v%s", VERSION)
+        log.info("Listening on UDP %s:%d (rcvbuf=%d bytes)", UDP_BIND_IP, UDP_PORT, rcvbuf)
+        if SAT_SENDER_IP:
+            log.info("Accepting packets from %s only", SAT_SENDER_IP)
+        log.info("Quit: Q / Ctrl+Q (console) OR UDP 'SAT,QUIT' to port %d", UDP_PORT)
 
-        # Remote quit
-        if is_remote_quit_packet(raw):
-            print(f"[INFO] Remote quit received from {addr[0]}. Shutting down...")
-            stop_event.set()
-            break
+        state: dict[str, SatState] = {}
 
-        parsed = parse_faos_packet(raw)
-        if not parsed:
-            continue
+        while not stop_event.is_set():
+            ready = sel.select()
+            if any(key.fileobj is wake_r for key, _ in ready):
+                drain_wakeup(wake_r)
+                continue
 
-        name, az, ttg = parsed
+            for data, addr in receiver.recv_batch():
+                if sender_ip is not None and addr[0] != sender_ip:
+                    continue
 
-        if ALLOWED_SATS and name not in ALLOWED_SATS:
-            continue
+                # Remote quit
+                if is_remote_quit_packet(data):
+                    log.info("Remote quit received from %s. Shutting down...", addr[0])
+                    stop_event.set()
+                    break
 
-        now = time.time()
-        st: SatState = state.get(
-            name,
-            {"last_ttg": None, "last_seen": 0.0, "alerted": False, "good_count": 0},
-        )
+                parsed = parse_faos_packet(data)
+                if not parsed:
+                    continue
 
-        # New pass detection (TTG jumps UP)
-        if st["last_ttg"] is not None and ttg > st["last_ttg"] + NEW_PASS_JUMP_SECONDS:
-            st = {"last_ttg": None, "last_seen": 0.0, "alerted": False, "good_count": 0}
+                name, az, ttg = parsed
 
-        # Update time-consistency score BEFORE overwriting last_seen/last_ttg
-        st = update_realtime_good_count(st, ttg, now)
+                if not sat_allowed(name):
+                    continue
 
-        # Store last packet info
-        st["last_ttg"] = ttg
-        st["last_seen"] = now
-        state[name] = st
+                now = time.monotonic()
+                st = state.get(name)
+                if st is None:
+                    st = state[name] = SatState()
 
-        rt = "OK" if realtime_ok(st) else f"SYNC({st['good_count']}/{CONSECUTIVE_GOOD_REQUIRED})"
-        print(f"FAOS {name}: ttg={ttg} az={az:.1f} from {addr[0]} realtime={rt}")
+                # New pass detection (TTG jumps UP): re-arm alerts and require re-sync
+                if st.last_ttg is not None and ttg > st.last_ttg + NEW_PASS_JUMP_SECONDS:
+                    st.pass_gen += 1
+                    st.good_count = 0
 
-        # Only alert on real-time stream
-        if not realtime_ok(st):
-            continue
+                # Update time-consistency score BEFORE overwriting last_seen/last_ttg
+                update_realtime_good_count(st, ttg, now)
 
-        if ttg > ALERT_THRESHOLD_SECONDS:
-            continue
+                # Store last packet info
+                st.last_ttg = ttg
+                st.last_seen = now
 
-        if SPEAK_ONCE_PER_PASS and st["alerted"]:
-            continue
+                rt_ok = st.good_count >= CONSECUTIVE_GOOD_REQUIRED
+                if log.isEnabledFor(logging.DEBUG):
+                    rt = "OK" if rt_ok else f"SYNC({st.good_count}/{CONSECUTIVE_GOOD_REQUIRED})"
+                    log.debug(
+                        "FAOS %s: ttg=%d az=%s from %s realtime=%s",
+                        name, ttg, az.decode(errors="replace"), addr[0], rt,
+                    )
 
-        st["alerted"] = True
-        state[name] = st
+                # Outside the alert window is the common case, so test it first
+                if ttg > ALERT_THRESHOLD_SECONDS:
+                    continue
 
-        # Requested wording: "<NAME> Rising"
-        title = f"{name} Rising"
-        mmss = format_mmss(ttg)
-        message = f"{name} Rising in {mmss}"
+                # Only alert on real-time stream
+                if not rt_ok:
+                    continue
 
-        # Voice: do NOT read azimuth
-        voice_text = f"{name} rising in {ttg} seconds."
+                if SPEAK_ONCE_PER_PASS and st.alerted_gen == st.pass_gen:
+                    continue
 
-        if ENABLE_VOICE:
-            try:
-                speak(voice_text)
-            except Exception as e:
-                print(f"[WARN] Voice failed: {e}")
+                st.alerted_gen = st.pass_gen
 
-        if ENABLE_POPUP:
-            try:
-                popup_timeout(title, message, POPUP_TIMEOUT_SECONDS)
-            except Exception as e:
-                print(f"[WARN] Popup failed: {e}")
+                # Requested wording: "<NAME> Rising"
+                title = f"{name} Rising"
+                mmss = format_mmss(ttg)
+                message = f"{name} Rising in {mmss}"
 
-    try:
-        sock.close()
-    except Exception:
-        pass
+                # Voice: do NOT read azimuth
+                voice_text = f"{name} rising in {ttg} seconds."
+
+                log.info("Alert: %s (ttg=%d)", message, ttg)
+
+                if ENABLE_VOICE:
+                    post_latest(_voice_queue, (voice_text,))
+
+                if ENABLE_POPUP:
+                    post_latest(_popup_queue, (title, message))
 
 
 # -----------------------------
@@ -378,26 +776,47 @@ def listener_run(stop_event: threading.Event) -> None:
 # -----------------------------
 
 def main() -> int:
+    logging.basicConfig(stream=sys.stdout, format="[%(levelname)s] %(message)s")
+    tune_process_scheduling()
+
     stop_event = threading.Event()
+    wake_r, wake_w = make_wakeup_pair()
+
+    # Ctrl+C also writes to the wakeup pair, so select() returns and the
+    # pending KeyboardInterrupt is raised (select is not interruptible on Windows).
+    signal.set_wakeup_fd(wake_w.fileno())
 
-    t = threading.Thread(target=hotkey_watcher, args=(stop_event,), daemon=True)
+    t = threading.Thread(target=hotkey_watcher, args=(stop_event, wake_w), daemon=True)
     t.start()
 
+    for q, label, fn in ((_voice_queue, "Voice", speak), (_popup_queue, "Popup", popup_timeout)):
+        threading.Thread(target=alert_worker, args=(q, label, fn), daemon=True).start()
+
     while not stop_event.is_set():
         try:
-            listener_run(stop_event)
+            listener_run(stop_event, wake_r)
         except KeyboardInterrupt:
-            print("\n[INFO] Ctrl+C received. Shutting down...")
-            stop_event.set()
+            log.info("Ctrl+C received. Shutting down...")
+            request_stop(stop_event, wake_w)
         except Exception as e:
-            print(f"[ERROR] Listener crashed: {e!r}")
+            log.error("Listener crashed: %r", e)
             if not RESTART_ON_ERROR:
                 stop_event.set()
             else:
-                print(f"[INFO] Restarting in {RESTART_DELAY_SECONDS} seconds...")
-                time.sleep(RESTART_DELAY_SECONDS)
-
-    print("[INFO] Exited cleanly.")
+                log.info("Restarting in %s seconds...", RESTART_DELAY_SECONDS)
+                # Returns early (True) if a quit arrives during the delay
+                try:
+                    if stop_event.wait(RESTART_DELAY_SECONDS):
+                        break
+                except KeyboardInterrupt:
+                    log.info("Ctrl+C received. Shutting down...")
+                    request_stop(stop_event, wake_w)
+
+    signal.set_wakeup_fd(-1)
+    wake_r.close()
+    wake_w.close()
+
+    log.info("Exited cleanly.")
     return 0
 
 